@@ -21,7 +21,7 @@
 __all__ = ['UltraDict']
 
 import multiprocessing, multiprocessing.shared_memory, multiprocessing.synchronize
-import collections, os, pickle, sys, time, weakref
+import collections, collections.abc, contextlib, ctypes, functools, marshal, os, pickle, platform, pprint, struct, sys, time, types, weakref
 import importlib.util, importlib.machinery
 
 try:
@@ -70,15 +70,151 @@ def remove_shm_from_resource_tracker():
 #More details at: https://bugs.python.org/issue38119
 remove_shm_from_resource_tracker()
 
+FUTEX_WAIT = 0
+FUTEX_WAKE = 1
+
+def get_futex():
+    """
+    Get a function to call the Linux futex syscall through ctypes, or None if it is not available.
+
+    Processes waiting for the shared lock use it to sleep until the lock word changes
+    instead of polling the shared memory. The futex must not be private, as it
+    is shared across processes.
+    """
+    if not sys.platform.startswith('linux'):
+        return None
+
+    # Syscall numbers depend on the architecture of the userland, which can be 32 bit on a 64 bit kernel
+    if sys.maxsize > 2**32:
+        numbers = { 'x86_64': 202, 'aarch64': 98, 'riscv64': 98, 'ppc64le': 221, 'ppc64': 221, 's390x': 238 }
+    else:
+        numbers = { 'i386': 240, 'i686': 240, 'x86_64': 240, 'armv6l': 240, 'armv7l': 240, 'armv8l': 240, 'aarch64': 240,
+                    'ppc': 221, 'ppc64le': 221, 'ppc64': 221, 's390x': 238 }
+
+    number = numbers.get(platform.machine())
+    if number is None:
+        return None
+
+    try:
+        syscall = ctypes.CDLL(None, use_errno=True).syscall
+    except (OSError, AttributeError):
+        return None
+
+    class Timespec(ctypes.Structure):
+        _fields_ = [ ('tv_sec', ctypes.c_long), ('tv_nsec', ctypes.c_long) ]
+
+    # The timeout of FUTEX_WAIT is relative and not changed by the kernel, and waiting
+    # processes always pass the same one, so every timespec is only built once
+    timespecs = {}
+
+    def futex(address, op, value, timeout=None):
+        if timeout is not None:
+            timespec = timespecs.get(timeout)
+            if timespec is None:
+                seconds, nanoseconds = divmod(round(timeout * 1_000_000_000), 1_000_000_000)
+                timespec = timespecs[timeout] = ctypes.byref(Timespec(seconds, nanoseconds))
+            timeout = timespec
+        return syscall(number, ctypes.c_void_p(address), ctypes.c_long(op), ctypes.c_long(value), timeout, None, ctypes.c_long(0))
+
+    return futex
+
+futex = get_futex()
+
+# On x86 and s390x, plain aligned stores and loads already have release and acquire semantics.
+# On other architectures, we need atomics to publish the stream position to other processes.
+strong_memory_order = platform.machine().lower() in ('x86_64', 'amd64', 'i386', 'i686', 'x86', 's390x')
+
+# Types that marshal writes and reads back as exactly the same type. Other objects
+# supporting the buffer protocol, like bytearray or memoryview, would silently come
+# back as bytes, so they have to go through pickle instead.
+marshal_scalar_types = frozenset((type(None), bool, int, float, complex, str, bytes))
+marshal_container_types = frozenset((tuple, list, set, frozenset))
+
+def marshal_safe(value):
+    """ Check if `value` only consists of types that survive a round trip through marshal """
+    value_type = type(value)
+    if value_type in marshal_scalar_types:
+        return True
+    if value_type in marshal_container_types:
+        for item in value:
+            if not marshal_safe(item):
+                return False
+        return True
+    if value_type is dict:
+        for key, item in value.items():
+            if not (marshal_safe(key) and marshal_safe(item)):
+                return False
+        return True
+    return False
+
 class UltraDict(collections.UserDict, dict):
 
     Exceptions = Exceptions
     log = log
 
+    class Control(ctypes.LittleEndianStructure):
+        """
+        Layout of the control memory.
+
+        Mapped over `control.buf` so the header fields can be read and written
+        as plain attributes without converting memoryview slices from and to bytes.
+        """
+        _pack_ = 1
+        _fields_ = [
+            ('update_stream_position', ctypes.c_uint32),    #  0:  4
+            ('lock',                   ctypes.c_uint32),    #  4:  8
+            ('full_dump_counter',      ctypes.c_uint32),    #  8: 12, aligned for atomic access
+            ('full_dump_static_size',  ctypes.c_uint32),    # 12: 16
+            ('single_writer',          ctypes.c_char),      # 16: 17
+            ('unused',                 ctypes.c_char),      # 17: 18
+            ('shared_lock',            ctypes.c_char),      # 18: 19
+            ('recurse',                ctypes.c_char),      # 19: 20
+            ('full_dump_memory_name',  ctypes.c_char * 255) # 20:275, first byte is the length
+        ]
+
+    class ClosedControl():
+        """
+        Stands in for the control memory after close().
+
+        Its counters never match the local ones, so the fast path of the read methods
+        always calls apply_update() which then raises AlreadyClosed.
+        """
+
+        __slots__ = ()
+
+        update_stream_position = -1
+        full_dump_counter = -1
+
     class RLock(multiprocessing.synchronize.RLock):
         """ Not yet used """
         pass
 
+    class NoLock():
+        """
+        Lock that does nothing, used with single_writer=True.
+
+        If only one thread of one process is writing, there is nothing to synchronize.
+        Readers never need the lock, they only rely on the stream position being
+        published after the update has been written.
+
+        The lock does not keep the writer away, so a reader that has fallen behind by
+        more than one full dump can only recover on a best-effort basis.
+        """
+
+        __slots__ = ()
+
+        def acquire(self, *args, **kwargs):
+            return True
+
+        def release(self, *args):
+            return True
+
+        def __enter__(self):
+            return True
+
+        def __exit__(self, *args):
+            pass
+
     class SharedLock():
         """
         Lock stored in shared_memory to provide an additional layer of protection,
@@ -87,13 +223,34 @@ class UltraDict(collections.UserDict, dict):
         Internally uses atomics package of patomics for atomic locking.
 
         This is needed if you write to the shared memory with independent processes.
+
+        The lock is a single 32 bit word that contains the pid of the owner with the
+        highest bit set while the lock is held, or zero if the lock is free. This way,
+        the lock and its owner are always changed together with one atomic operation.
+        The second highest bit is set by processes sleeping on the futex, so that only
+        a contended release has to pay for the wake up system call.
         """
 
-        __slots__ = 'parent', 'has_lock',  'ctx', 'lock_atomic', 'lock_remote', \
-            'pid', 'pid_bytes', 'pid_remote', 'pid_remote_ctx', 'pid_remote_atomic', \
-            'next_acquire_parameters'
+        __slots__ = 'parent', 'has_lock',  'ctx', 'lock_atomic', 'lock_remote', 'lock_word', 'lock_address', \
+            'pid', 'lock_bytes', 'lock_bytes_contended', 'next_acquire_parameters'
+
+        # Highest bit of the lock word, set while the lock is held
+        locked_bit = 0x80000000
+        # Second highest bit of the lock word, set if processes might be waiting on the futex
+        waiters_bit = 0x40000000
+        pid_mask = waiters_bit - 1
+
+        # Number of failed attempts to acquire the lock that are retried immediately
+        # before we start to yield the CPU, and the number of attempts after which
+        # we fall back to sleeping for `sleep_time` between attempts
+        spin_attempts = 16
+        yield_attempts = 64
+
+        # Maximum time to sleep on the futex before checking the lock again. Waiters
+        # are woken up on release, this only matters if the lock owner has died.
+        futex_timeout = 0.01
 
-        def __init__(self, parent, lock_name, pid_name):
+        def __init__(self, parent, lock_name):
             self.has_lock = 0
             self.next_acquire_parameters = ()
 
@@ -101,18 +258,21 @@ class UltraDict(collections.UserDict, dict):
             # to store the memory view on the remote lock, so `self.lock_remote` is
             # referring to a memory view
             self.lock_remote = getattr(parent, lock_name)
-            self.pid_remote = getattr(parent, pid_name)
+            # Plain reads of the lock word go through ctypes instead of converting
+            # the memory view with int.from_bytes() every time
+            self.lock_word = ctypes.c_uint32.__ctype_le__.from_buffer(self.lock_remote)
 
             self.init_pid()
 
             try:
-                self.ctx = atomics.atomicview(buffer=self.lock_remote[0:1], atype=atomics.BYTES)
-                self.pid_remote_ctx = atomics.atomicview(buffer=self.pid_remote[0:4], atype=atomics.BYTES)
+                self.ctx = atomics.atomicview(buffer=self.lock_remote[0:4], atype=atomics.BYTES)
             except NameError as e:
                 self.cleanup()
                 raise e
             self.lock_atomic = self.ctx.__enter__()
-            self.pid_remote_atomic = self.pid_remote_ctx.__enter__()
+
+            if futex:
+                self.lock_address = ctypes.addressof(self.lock_word)
 
             def after_fork():
                 if self.has_lock:
@@ -125,35 +285,48 @@ class UltraDict(collections.UserDict, dict):
                 os.register_at_fork(after_in_child=after_fork)
 
         def init_pid(self):
-            self.pid = multiprocessing.current_process().pid
-            self.pid_bytes = self.pid.to_bytes(4, 'little')
+            self.pid = os.getpid()
+            assert self.pid <= self.pid_mask, f"pid {self.pid} does not fit into the lock word"
+            # Value of the lock word while we hold the lock
+            self.lock_bytes = (self.locked_bit | self.pid).to_bytes(4, 'little')
+            # Value of the lock word while we hold the lock and others might still be waiting
+            self.lock_bytes_contended = (self.locked_bit | self.waiters_bit | self.pid).to_bytes(4, 'little')
 
         def acquire_with_timeout(self, block=True, sleep_time=0.000001, timeout=1.0, steal_after_timeout=False):
             # The block parameter will be ignored
             time_start = None
             blocking_pid = None
+            attempts = 0
             while True:
-                try:
-                    return self.acquire(block=False, sleep_time=sleep_time)
-                except Exceptions.CannotAcquireLock as e:
-                    if not time_start:
-                        time_start = e.timestamp
-                        blocking_pid = e.blocking_pid
-
-                    # We should not be the blocking pid
-                    assert blocking_pid != self.pid
-
-                    time_passed = time.monotonic() - time_start
-
-                    if time_passed >= timeout:
-                        if steal_after_timeout:
-                            # If the blocking pid has changed meanwhile, someone else took or stole the lock
-                            if blocking_pid == e.blocking_pid:
-                                self.steal_from_dead(from_pid=blocking_pid, release=True)
-                            time_start = None
-                            blocking_pid = None
-                            continue
-                        raise Exceptions.CannotAcquireLockTimeout(blocking_pid = e.blocking_pid, timestamp=time_start) from None
+                # Once we might have slept on the futex, keep the waiters bit set when we
+                # get the lock as other processes might still be sleeping, too
+                if self.test_and_inc(contended=attempts > self.yield_attempts):
+                    self.has_lock = 1
+                    return True
+
+                current_pid = self.get_remote_pid()
+                if not time_start:
+                    time_start = time.monotonic()
+                    blocking_pid = current_pid
+                    attempts = 0
+
+                attempts += 1
+                self.backoff(attempts, sleep_time)
+
+                # We should not be the blocking pid
+                assert blocking_pid != self.pid
+
+                time_passed = time.monotonic() - time_start
+
+                if time_passed >= timeout:
+                    if steal_after_timeout:
+                        # If the blocking pid has changed meanwhile, someone else took or stole the lock
+                        if blocking_pid == current_pid:
+                            self.steal_from_dead(from_pid=blocking_pid, release=True)
+                        time_start = None
+                        blocking_pid = None
+                        continue
+                    raise Exceptions.CannotAcquireLockTimeout(blocking_pid=current_pid, timestamp=time_start)
 
 
         #@profile
@@ -163,43 +336,91 @@ class UltraDict(collections.UserDict, dict):
                 self.has_lock += 1
                 return True
 
+            # Uncontended fast path, same as test_and_inc() but without the method call
+            if not self.lock_remote[3] and self.lock_atomic.cmpxchg_strong(expected=b'\x00\x00\x00\x00', desired=self.lock_bytes).success:
+                self.has_lock = 1
+                return True
+
             if timeout:
                 return self.acquire_with_timeout(sleep_time=sleep_time, timeout=timeout, steal_after_timeout=steal_after_timeout)
 
-            while True:
-                # We need both, the shared lock to be False and the lock_pid to be 0
-                if self.test_and_inc():
+            return self.acquire_slow(block=block, sleep_time=sleep_time)
 
-                    assert self.has_lock == 0
-                    self.has_lock = 1
+        def acquire_slow(self, block=True, sleep_time=0.000001):
+            """ Wait for the lock after the fast path in acquire() has failed """
+            if not block:
+                raise Exceptions.CannotAcquireLock(blocking_pid=self.get_remote_pid())
 
-                    # If nobody had owned the lock, so the remote pid should be zero
-                    assert self.pid_remote[0:4] == b'\x00\x00\x00\x00'
+            attempts = 0
+            while True:
+                attempts += 1
+                self.backoff(attempts, sleep_time)
 
-                    self.pid_remote[:] = self.pid_bytes
+                # Sets the lock bit and our pid at once if nobody holds the lock
+                # The compare-exchange only succeeds if the lock was free, so has_lock must be 0
+                if self.test_and_inc(contended=attempts > self.yield_attempts):
+                    self.has_lock = 1
                     return True
 
-                # If set to 0, we practically have a busy wait
-                if sleep_time:
+        def backoff(self, attempts, sleep_time):
+            """
+            Escalating backoff after a failed attempt to acquire the lock.
+
+            First retry right away as the lock is usually only held for a short time,
+            then yield the CPU to give the lock holder a chance to run and finally sleep.
+            """
+            # If set to 0, we practically have a busy wait
+            if not sleep_time:
+                return
+            if attempts > self.yield_attempts:
+                if futex:
+                    self.wait()
+                else:
                     # On Python < 3.10, this smallest possible time is actually rather big,
                     #  maybe around 10 ms, depending on your CPU.
                     time.sleep(sleep_time)
+            elif attempts > self.spin_attempts:
+                time.sleep(0)
 
-                if not block:
-                    raise Exceptions.CannotAcquireLock(blocking_pid=self.get_remote_pid())
+        def wait(self):
+            """
+            Sleep on the futex until the lock word changes, which usually means that the
+            lock was released, or until `futex_timeout` has passed.
+            """
+            value = self.lock_word.value
+            if not value & self.locked_bit:
+                return
+            word = value.to_bytes(4, 'little')
+            if not value & self.waiters_bit:
+                # Set the waiters bit, so the lock owner knows it has to wake us up on release.
+                # If the lock word has changed meanwhile, don't sleep but try again to acquire.
+                desired = (value | self.waiters_bit).to_bytes(4, 'little')
+                if not self.lock_atomic.cmpxchg_strong(expected=word, desired=desired).success:
+                    return
+                word = desired
+            # The kernel compares the word in native byte order
+            futex(self.lock_address, FUTEX_WAIT, int.from_bytes(word, sys.byteorder), self.futex_timeout)
 
         #@profile
-        def test_and_inc(self):
-            old = self.lock_atomic.exchange(b'\x01')
-            if old != b'\x00':
-                # Oops, someone else was faster than us
+        def test_and_inc(self, contended=False):
+            # Test before test-and-set: A plain read of the lock word is cheap and
+            # does not write to the shared cache line, so waiting processes only
+            # issue the atomic compare-exchange when the lock looks free.
+            # Little endian, so the lock bit is in the last byte.
+            if self.lock_remote[3]:
                 return False
-            return True
+            # Oops, if it fails someone else was faster than us
+            desired = self.lock_bytes_contended if contended else self.lock_bytes
+            return self.lock_atomic.cmpxchg_strong(expected=b'\x00\x00\x00\x00', desired=desired).success
 
         #@profile
         def test_and_dec(self):
-            old = self.lock_atomic.exchange(b'\x00')
-            if old != b'\x01':
+            """
+            Checked release of the shared lock word. Not used by release() which does
+            not need the exchange, but still useful for debugging a broken lock state.
+            """
+            old = self.lock_atomic.exchange(b'\x00\x00\x00\x00')
+            if old not in (self.lock_bytes, self.lock_bytes_contended):
                 raise Exception("Failed to release lock")
             return True
 
@@ -207,23 +428,27 @@ class UltraDict(collections.UserDict, dict):
         def release(self, *args):
             #log.debug("Release lock, lock={}", self.has_lock)
             if self.has_lock > 0:
-                owner = int.from_bytes(self.pid_remote, 'little')
+                owner = self.get_remote_pid()
                 if owner != self.pid:
                     raise Exception(f"Our lock for pid {self.pid} was stolen by pid {owner}")
                 self.has_lock -= 1
                 # Last local lock released, release shared lock
                 if not self.has_lock:
-                    self.pid_remote[:] = b'\x00\x00\x00\x00'
-                    self.test_and_dec()
-                #log.debug("Relased lock, lock={} pid_remote={}", self.has_lock, int.from_bytes(self.pid_remote, 'little'))
+                    # Waiting processes can still set the waiters bit while we own the lock,
+                    # so we need an exchange. It clears the lock bit and our pid at once.
+                    old = self.lock_atomic.exchange(b'\x00\x00\x00\x00', order=atomics.MemoryOrder.RELEASE)
+                    # Only wake up one waiting process if there are any, an
+                    # uncontended release does not need the system call
+                    if futex and old[3] & 0x40:
+                        futex(self.lock_address, FUTEX_WAKE, 1)
+                #log.debug("Relased lock, lock={} pid_remote={}", self.has_lock, self.get_remote_pid())
                 return True
 
             return False
 
         def reset(self):
             # Risky
-            self.lock_remote[:] = b'\x00'
-            self.pid_remote[:] = b'\x00\x00\x00\x00'
+            self.lock_remote[:] = b'\x00\x00\x00\x00'
             self.has_lock = 0
 
         def reset_acquire_parameters(self):
@@ -245,7 +470,13 @@ class UltraDict(collections.UserDict, dict):
 
             # Stealing the lock means actually just putting our pid into the shared memory overwriting the other pid.
             # This can go wrong if the lock owner is actually still alive and working.
-            result = self.pid_remote_atomic.cmpxchg_strong(expected=from_pid.to_bytes(4, 'little'), desired=self.pid_bytes)
+            # Keep the waiters bit, so our release still wakes up the waiting processes
+            value = self.lock_word.value
+            if not value & self.locked_bit or value & self.pid_mask != from_pid:
+                return False
+            expected = value.to_bytes(4, 'little')
+            desired = self.lock_bytes_contended if value & self.waiters_bit else self.lock_bytes
+            result = self.lock_atomic.cmpxchg_strong(expected=expected, desired=desired)
             if result.success:
                 self.has_lock = 1
                 if release:
@@ -257,6 +488,17 @@ class UltraDict(collections.UserDict, dict):
                 Optionally, the lock can be directly released after stealing it.
             """
 
+            # Cheap check first: If no process with from_pid exists at all, it is safe to steal
+            # the lock without asking psutil. On Windows, os.kill() would terminate the process.
+            if sys.platform != 'win32':
+                try:
+                    os.kill(from_pid, 0)
+                except ProcessLookupError:
+                    return self.steal(from_pid=from_pid, release=release)
+                except PermissionError:
+                    # The process exists but belongs to someone else
+                    pass
+
             try:
                 import psutil
             except ModuleNotFoundError:
@@ -278,13 +520,12 @@ class UltraDict(collections.UserDict, dict):
         def status(self):
             return {
                 'has_lock': self.has_lock,
-                'lock_remote': int.from_bytes(self.lock_remote, 'little'),
+                'lock_remote': self.get_remote_lock(),
                 'pid': self.pid,
-                'pid_remote': int.from_bytes(self.pid_remote, 'little'),
+                'pid_remote': self.get_remote_pid(),
             }
 
         def print_status(self, status=None):
-            import pprint
             if not status:
                 status = self.status()
             pprint.pprint(status)
@@ -295,28 +536,29 @@ class UltraDict(collections.UserDict, dict):
                 del self.ctx
             if hasattr(self, 'lock_atomic'):
                 del self.lock_atomic
-            if hasattr(self, 'pid_remote_ctx'):
-                self.pid_remote_ctx.__exit__(None, None, None)
-                del self.pid_remote_ctx
-            if hasattr(self, 'pid_remote_aotmic'):
-                del self.pid_remote_atomic
+            if hasattr(self, 'lock_word'):
+                del self.lock_word
             del self.lock_remote
-            del self.pid_remote
-            del self.pid_bytes
+            del self.lock_bytes
             del self.pid
 
         def get_remote_pid(self):
-            return int.from_bytes(self.pid_remote, 'little')
+            return self.lock_word.value & self.pid_mask
 
         def get_remote_lock(self):
-            return int.from_bytes(self.lock_remote, 'little')
+            return self.lock_word.value >> 31
 
         def __repr__(self):
-            return f"{self.__class__.__name__} @{hex(id(self))} lock_remote={int.from_bytes(self.lock_remote, 'little')}, has_lock={self.has_lock}, pid={self.pid}), pid_remote={int.from_bytes(self.pid_remote, 'little')}"
+            return f"{self.__class__.__name__} @{hex(id(self))} lock_remote={self.get_remote_lock()}, has_lock={self.has_lock}, pid={self.pid}), pid_remote={self.get_remote_pid()}"
 
         def __enter__(self):
-            self.acquire(*self.next_acquire_parameters)
-            self.reset_acquire_parameters()
+            # Plain `with lock:` is the common case, only unpack parameters set by __call__()
+            parameters = self.next_acquire_parameters
+            if parameters:
+                self.next_acquire_parameters = ()
+                self.acquire(*parameters)
+            else:
+                self.acquire()
             return self
 
         def __exit__(self, type, value, traceback):
@@ -325,15 +567,51 @@ class UltraDict(collections.UserDict, dict):
             return False
 
         def __call__(self, block=True, timeout=None, sleep_time=0.000001, steal_after_timeout=False):
-            self.next_acquire_parameters = ( block, timeout, sleep_time, steal_after_timeout )
+            # Same order as the positional parameters of acquire()
+            self.next_acquire_parameters = ( block, sleep_time, timeout, steal_after_timeout )
 
             return self
 
-    __slots__ = 'name', 'control', 'buffer', 'buffer_size', 'lock', 'shared_lock', \
+    # Header in front of every update in the stream and in front of the full dump,
+    # a FF byte, 4 bytes of length of the body and another FF byte
+    header = struct.Struct('<BIB')
+
+    # Compact update record for the common case of setting an int value with a str key.
+    # It is marked by a FE byte instead of the FF byte at the end of the header, the body
+    # is the value as 8 bytes followed by the key, so no serializer is needed.
+    int_record = struct.Struct('<q')
+
+    # With the default pickle serializer, update records of builtin types are serialized
+    # with marshal which is a lot faster for small values. Such records are marked by a
+    # FD byte at the end of the header, anything that marshal cannot handle falls back
+    # to pickle and is marked by the usual FF byte.
+    @staticmethod
+    def marshal_record(record):
+        try:
+            if marshal_safe(record):
+                return 0xFD, marshal.dumps(record)
+        except (RecursionError, ValueError):
+            pass
+        return 0xFF, pickle.dumps(record, protocol=5)
+
+    # Marks a key deleted inside of a `with bulk():` block in `bulk_items`
+    bulk_deleted = object()
+
+    # How often apply_update() retries without the lock if a new full dump has replaced
+    # the stream while it was reading, before it falls back to retrying with the lock
+    max_retries = 8
+
+    # All attributes referring to the control memory, created by init_remotes()
+    remote_attributes = ('control_remote', 'update_stream_position_remote', 'lock_remote',
+        'full_dump_counter_remote', 'full_dump_static_size_remote', 'shared_lock_remote',
+        'recurse_remote', 'full_dump_memory_name_remote')
+
+    __slots__ = 'name', 'control', 'control_remote', 'buffer', 'buffer_size', 'lock', 'shared_lock', \
         'update_stream_position', 'update_stream_position_remote', \
+        'update_stream_position_ctx', 'update_stream_position_atomic', \
         'full_dump_counter', 'full_dump_memory', 'full_dump_size', \
-        'serializer', \
-        'lock_pid_remote', \
+        'full_dump_counter_ctx', 'full_dump_counter_atomic', \
+        'serializer', 'serializer_dumps', 'serializer_loads', 'serialize_record', \
         'lock_remote', \
         'full_dump_counter_remote', \
         'full_dump_static_size_remote', \
@@ -341,10 +619,13 @@ class UltraDict(collections.UserDict, dict):
         'recurse', 'recurse_remote', 'recurse_register', \
         'full_dump_memory_name_remote', \
         'data', 'closed', 'auto_unlink', \
-        'finalizer'
+        'finalizer', 'bulk_items'
+
+    # Attributes shown by status(), the dict data itself can be huge
+    status_attributes = tuple(attr for attr in __slots__ if attr not in ('data', 'bulk_items'))
 
     def __init__(self, *args, name=None, create=None, buffer_size=10_000, serializer=pickle, shared_lock=None, full_dump_size=None,
-            auto_unlink=None, recurse=None, recurse_register=None, **kwargs):
+            auto_unlink=None, recurse=None, recurse_register=None, single_writer=None, **kwargs):
         # pylint: disable=too-many-branches, too-many-statements
 
         # On win32, only multiples of 4k are allowed
@@ -358,8 +639,15 @@ class UltraDict(collections.UserDict, dict):
         if recurse:
             assert serializer == pickle
 
+        if single_writer:
+            assert not shared_lock, "single_writer=True does not need a shared_lock"
+
         self.data = {}
 
+        # Set up by init_remotes(), but close() needs them even if we fail before that
+        self.update_stream_position_ctx = self.update_stream_position_atomic = None
+        self.full_dump_counter_ctx = self.full_dump_counter_atomic = None
+
         # Local position, ie. the last position we have processed from the stream
         self.update_stream_position  = 0
 
@@ -368,6 +656,9 @@ class UltraDict(collections.UserDict, dict):
         self.full_dump_counter       = 0
 
         self.closed = False
+
+        # Changes collected inside of a `with bulk():` block, None outside of it
+        self.bulk_items = None
         self.auto_unlink = auto_unlink
 
         # Small 1000 bytes of shared memory where we store the runtime state
@@ -389,6 +680,18 @@ class UltraDict(collections.UserDict, dict):
 
         self.serializer = serializer
 
+        if serializer == pickle:
+            # Protocol 5 is available on all supported Python versions and writes large
+            # bytes-like values as a single frame. Pickle can read straight from the
+            # shared memory so there is no need to copy the data to bytes first.
+            self.serializer_dumps = functools.partial(pickle.dumps, protocol=5)
+            self.serializer_loads = pickle.loads
+            self.serialize_record = self.marshal_record
+        else:
+            dumps = self.serializer_dumps = serializer.dumps
+            self.serializer_loads = lambda data: serializer.loads(bytes(data))
+            self.serialize_record = lambda record: (0xFF, dumps(record))
+
         # Actual stream buffer that contains marshalled data of changes to the dict
         self.buffer = self.get_memory(create=create, name=self.name + '_memory', size=buffer_size)
         # TODO: Raise exception if buffer size mismatch
@@ -406,41 +709,51 @@ class UltraDict(collections.UserDict, dict):
                 self.auto_unlink = True
 
             if recurse:
-                self.recurse_remote[0:1] = b'1'
+                self.control_remote.recurse = b'1'
 
             if shared_lock:
-                self.shared_lock_remote[0:1] = b'1'
+                self.control_remote.shared_lock = b'1'
+
+            if single_writer:
+                self.control_remote.single_writer = b'1'
 
             # We created the control memory, thus let's check if we need to create the
             # full dump memory as well
             if full_dump_size:
                 self.full_dump_size = full_dump_size
-                self.full_dump_static_size_remote[:] = full_dump_size.to_bytes(4, 'little')
+                self.control_remote.full_dump_static_size = full_dump_size
 
                 self.full_dump_memory = self.get_memory(create=True, name=self.name + '_full', size=full_dump_size)
-                self.full_dump_memory_name_remote[:] = self.full_dump_memory.name.encode('utf-8').ljust(255)
+                self.set_full_dump_memory_name(self.full_dump_memory.name)
 
         # We just attached to the existing control
         else:
             # TODO: Detect configuration mismatch and raise an exception
 
             # Check if we have a fixed size full dump memory
-            size = int.from_bytes(self.full_dump_static_size_remote, 'little')
+            size = self.control_remote.full_dump_static_size
 
             # Check if shared_lock parameter was not set to inconsistent value
-            shared_lock_remote = self.shared_lock_remote[0:1] == b'1'
+            shared_lock_remote = self.control_remote.shared_lock == b'1'
             if shared_lock is None:
                 shared_lock = shared_lock_remote
             elif shared_lock != shared_lock_remote:
                 raise Exceptions.ParameterMismatch(f"shared_lock={shared_lock} was set but the creator has used shared_lock={shared_lock_remote}")
 
             # Check if recurse parameter was not set to inconsistent value
-            recurse_remote = self.recurse_remote[0:1] == b'1'
+            recurse_remote = self.control_remote.recurse == b'1'
             if recurse is None:
                 recurse = recurse_remote
             elif recurse != recurse_remote:
                 raise Exceptions.ParameterMismatch(f"recure={recurse} was set but the creator has used recurse={recurse_remote}")
 
+            # Check if single_writer parameter was not set to inconsistent value
+            single_writer_remote = self.control_remote.single_writer == b'1'
+            if single_writer is None:
+                single_writer = single_writer_remote
+            elif single_writer != single_writer_remote:
+                raise Exceptions.ParameterMismatch(f"single_writer={single_writer} was set but the creator has used single_writer={single_writer_remote}")
+
             # Got existing size of full dump memory, that must mean it's static size
             # and we should attach to it
             if size > 0:
@@ -448,9 +761,11 @@ class UltraDict(collections.UserDict, dict):
                 self.full_dump_memory = self.get_memory(create=False, name=self.name + '_full')
 
         # Local lock for all processes and threads created by the same interpreter
-        if shared_lock:
+        if single_writer:
+            self.lock = self.NoLock()
+        elif shared_lock:
             try:
-                self.lock = self.SharedLock(self, 'lock_remote', 'lock_pid_remote')
+                self.lock = self.SharedLock(self, 'lock_remote')
             except NameError:
                 #self.cleanup()
                 raise Exceptions.MissingDependency("Install `atomics` Python package to use shared_lock=True") from None
@@ -466,9 +781,9 @@ class UltraDict(collections.UserDict, dict):
         if self.recurse:
             # Must be either the name of an UltraDict as a string or an UltraDict instance
             if recurse_register is not None:
-                if type(recurse_register) == str:
+                if type(recurse_register) is str:
                     self.recurse_register = UltraDict(name=recurse_register)
-                elif type(recurse_register) == UltraDict:
+                elif type(recurse_register) is UltraDict:
                     self.recurse_register = recurse_register
                 else:
                     raise Exception("Bad type for recurse_register")
@@ -485,7 +800,10 @@ class UltraDict(collections.UserDict, dict):
         else:
             self.recurse_register = None
 
-        super().__init__(*args, **kwargs)
+        # Write the initial items as one batch update instead of letting
+        # UserDict.__init__() set them one by one
+        if args or kwargs:
+            self.update(*args, **kwargs)
 
         # Load all data from shared memory
         self.apply_update()
@@ -512,27 +830,90 @@ class UltraDict(collections.UserDict, dict):
 
 
     def init_remotes(self):
+        # Structured view on self.control, used for the header fields
+        self.control_remote = self.Control.from_buffer(self.control.buf)
+
         # Memoryviews to the right buffer position in self.control
         self.update_stream_position_remote = self.control.buf[ 0:  4]
-        self.lock_pid_remote               = self.control.buf[ 4:  8]
-        self.lock_remote                   = self.control.buf[ 8: 10]
-        self.full_dump_counter_remote      = self.control.buf[10: 14]
-        self.full_dump_static_size_remote  = self.control.buf[14: 18]
+        self.lock_remote                   = self.control.buf[ 4:  8]
+        self.full_dump_counter_remote      = self.control.buf[ 8: 12]
+        self.full_dump_static_size_remote  = self.control.buf[12: 16]
         self.shared_lock_remote            = self.control.buf[18: 19]
         self.recurse_remote                = self.control.buf[19: 20]
         self.full_dump_memory_name_remote  = self.control.buf[20:275]
 
+        self.update_stream_position_atomic = None
+        self.full_dump_counter_atomic = None
+        if not strong_memory_order:
+            try:
+                self.update_stream_position_ctx = atomics.atomicview(buffer=self.update_stream_position_remote, atype=atomics.BYTES)
+                self.update_stream_position_atomic = self.update_stream_position_ctx.__enter__()
+                self.full_dump_counter_ctx = atomics.atomicview(buffer=self.full_dump_counter_remote, atype=atomics.BYTES)
+                self.full_dump_counter_atomic = self.full_dump_counter_ctx.__enter__()
+            except NameError:
+                # Without atomics, we can only hope for the best
+                pass
+
     def del_remotes(self):
         """
-        Delete all instance attributes whose name ends with '_remote' from
+        Delete all instance attributes listed in `remote_attributes` from
         the instance for cleanup. This shall ensure there are no
         reference left to shared memory views so proper cleanup can happen.
         """
-        remotes = [ r for r in dir(self) if r.endswith('_remote') ]
-        for r in remotes:
+        if self.update_stream_position_atomic is not None:
+            self.update_stream_position_ctx.__exit__(None, None, None)
+            self.update_stream_position_atomic = None
+            del self.update_stream_position_ctx
+        if self.full_dump_counter_atomic is not None:
+            self.full_dump_counter_ctx.__exit__(None, None, None)
+            self.full_dump_counter_atomic = None
+            del self.full_dump_counter_ctx
+
+        for r in self.remote_attributes:
             if hasattr(self, r):
                 delattr(self, r)
 
+    def publish_full_dump_counter(self, counter):
+        """
+        Publish a new full dump counter, like the stream position. Other processes must see
+        the full dump and its memory name once they see the new counter.
+        """
+        if self.full_dump_counter_atomic is not None:
+            self.full_dump_counter_atomic.store(counter.to_bytes(4, 'little'), order=atomics.MemoryOrder.RELEASE)
+        else:
+            self.control_remote.full_dump_counter = counter
+
+    def read_full_dump_counter(self):
+        """ Read the remote full dump counter, pairs with publish_full_dump_counter() """
+        if self.full_dump_counter_atomic is not None:
+            return int.from_bytes(self.full_dump_counter_atomic.load(order=atomics.MemoryOrder.ACQUIRE), 'little')
+        return self.control_remote.full_dump_counter
+
+    def publish_update_stream_position(self, position):
+        """
+        Publish a new stream position. Other processes read the stream without any locking,
+        so they must see all data in the stream up to `position` once they see the position.
+        """
+        if self.update_stream_position_atomic is not None:
+            self.update_stream_position_atomic.store(position.to_bytes(4, 'little'), order=atomics.MemoryOrder.RELEASE)
+        else:
+            self.control_remote.update_stream_position = position
+
+    def get_full_dump_memory_name(self):
+        """ Name of the current full dump memory, empty if there is none yet """
+        length = self.full_dump_memory_name_remote[0]
+        return str(self.full_dump_memory_name_remote[1:1+length], 'utf-8')
+
+    def set_full_dump_memory_name(self, name):
+        name = name.encode('utf-8')
+        assert len(name) < 255, f"Name of full dump memory too long: {name}"
+        self.full_dump_memory_name_remote[1:1+len(name)] = name
+        # Set the length last, so the very first name is complete when others can see it.
+        # Later names of the same length are rewritten in place, so a reader without the
+        # lock can decode a mix of two names. Such a name does not exist and attaching it
+        # fails, get_full_dump_memory() then retries and finally reads it with the lock.
+        self.full_dump_memory_name_remote[0] = len(name)
+
     def __reduce__(self):
         from functools import partial
         return (partial(self.__class__, name=self.name, auto_unlink=self.auto_unlink, recurse_register=self.recurse_register), ())
@@ -545,22 +926,22 @@ class UltraDict(collections.UserDict, dict):
         If `create` is True, create the object if it does not exist.
         """
         assert size > 0 or not create
-        if name:
+        if name and create is not True:
             # First try to attach to existing memory
             try:
                 memory = multiprocessing.shared_memory.SharedMemory(name=name)
                 #log.debug('Attached shared memory: ', memory.name)
-
-                if create:
-                    raise Exceptions.AlreadyExists(f"Cannot create memory '{name}' because it already exists")
-
                 return memory
             except FileNotFoundError:
                 pass
 
         # No existing memory found
         if create or create is None:
-            memory = multiprocessing.shared_memory.SharedMemory(create=True, size=size, name=name)
+            # If we must create it, there's no need to try to attach first, creating fails anyway if it exists
+            try:
+                memory = multiprocessing.shared_memory.SharedMemory(create=True, size=size, name=name)
+            except FileExistsError:
+                raise Exceptions.AlreadyExists(f"Cannot create memory '{name}' because it already exists") from None
             #multiprocessing.resource_tracker.unregister(memory._name, 'shared_memory')
             # Remember that we have created this memory
             memory.created_by_ultra = True
@@ -575,11 +956,11 @@ class UltraDict(collections.UserDict, dict):
         """ Dump the full dict into shared memory """
 
         with self.lock:
-            old = bytes(self.full_dump_memory_name_remote).decode('utf-8').strip().strip('\x00')
+            old = self.get_full_dump_memory_name()
 
             self.apply_update()
 
-            marshalled = self.serializer.dumps(self.data)
+            marshalled = self.serializer_dumps(self.data)
             length = len(marshalled)
 
             # If we don't have a fixed size, let's create full dump memory dynamically
@@ -588,7 +969,8 @@ class UltraDict(collections.UserDict, dict):
             if self.full_dump_size and self.full_dump_memory:
                 full_dump_memory = self.full_dump_memory
             else:
-                # Dynamic full dump memory
+                # Dynamic full dump memory, a new one for every full dump. Others load the
+                # current one without the lock, so it must never be overwritten in place.
                 full_dump_memory = self.get_memory(create=True, size=length + 6)
 
             #log.debug("Full dump memory: ", full_dump_memory)
@@ -597,51 +979,43 @@ class UltraDict(collections.UserDict, dict):
                 raise Exceptions.FullDumpMemoryFull(f'Full dump memory too small for full dump: needed={length + 6} got={full_dump_memory.size}')
 
             # Write header, 6 bytes
-            # First byte is FF byte
-            full_dump_memory.buf[0:1] = b'\xFF'
-            # Then comes 4 bytes of length of the body
-            full_dump_memory.buf[1:5] = length.to_bytes(4, 'little')
-            # Then another FF bytes, end of header
-            full_dump_memory.buf[5:6] = b'\xFF'
+            self.header.pack_into(full_dump_memory.buf, 0, 0xFF, length, 0xFF)
 
             # Write body
             full_dump_memory.buf[6:6+length] = marshalled
 
-            # On Windows, if we close it, it cannot be read anymore by anyone else.
-            if not self.full_dump_size and sys.platform != 'win32':
-                full_dump_memory.close()
-
             # TODO: There's a slight chance of something going wrong when we first update
             #       the remote memory name and then the counter.
 
             # Only after we have filled the new full dump memory with the marshalled data,
             # we update the remote name so other users can find it
             if not (self.full_dump_size and self.full_dump_memory):
-                self.full_dump_memory_name_remote[:] = full_dump_memory.name.encode('utf-8').ljust(255)
+                self.set_full_dump_memory_name(full_dump_memory.name)
 
             self.full_dump_counter += 1
-            current = int.from_bytes(self.full_dump_counter_remote, 'little')
+            current = self.control_remote.full_dump_counter
             # Now also increment the remote counter
-            self.full_dump_counter_remote[:] = int(current + 1).to_bytes(4, 'little')
+            self.publish_full_dump_counter(current + 1)
 
             # Reset the stream position to zero as we have
             # just provided a fresh new full dump
             self.update_stream_position = 0
-            self.update_stream_position_remote[:] = b'\x00\x00\x00\x00'
+            self.publish_update_stream_position(0)
 
-            #log.info("Dumped dict with {} elements to {} bytes, remote_counter={}", len(self), len(marshalled), current+1)
+            #log.info("Dumped dict with {} elements to {} bytes, remote_counter={}", len(self), length, current+1)
 
             # If the old full dump memory was dynamically created, delete it
             if old and old != full_dump_memory.name and not self.full_dump_size:
                 self.unlink_by_name(old)
 
-            # On Windows, we need to keep a reference to the full dump memory,
-            # otherwise it's destoryed
+            # Keep the full dump memory attached, we can load it again without attaching
+            # as long as it has not been replaced. On Windows, we need to keep a reference
+            # to the full dump memory anyway, otherwise it's destoryed
             self.full_dump_memory = full_dump_memory
 
             return full_dump_memory
 
-    def get_full_dump_memory(self, max_retry=3, retry=0):
+    def get_full_dump_memory(self, max_retry=3):
         """
         Attach to the full dump memory.
 
@@ -650,20 +1024,29 @@ class UltraDict(collections.UserDict, dict):
         chance to read the old full dump.
 
         """
-        try:
-            name = bytes(self.full_dump_memory_name_remote).decode('utf-8').strip().strip('\x00')
-            #log.debug("Full dump name={}", name)
-            assert len(name) >= 1
-            return self.get_memory(create=False, name=name)
-        except Exceptions.CannotAttachSharedMemory as e:
-            if retry < max_retry:
-                return self.get_full_dump_memory(max_retry=max_retry, retry=retry+1)
-            elif retry == max_retry:
-                # On the last retry, let's use a lock to ensure we can safely import the dump
-                with self.lock:
-                    return self.get_full_dump_memory(max_retry=max_retry, retry=retry+1)
-            else:
-                raise e
+        delay = 0
+        for _ in range(max_retry + 1):
+            try:
+                return self.attach_full_dump_memory()
+            except Exceptions.CannotAttachSharedMemory:
+                # Give the process creating the new full dump a chance to publish its name.
+                # First only yield the CPU, then back off exponentially up to 10 ms.
+                time.sleep(delay)
+                delay = min(delay * 2 or 0.0001, 0.01)
+
+        # On the last retry, let's use a lock to ensure we can safely import the dump
+        with self.lock:
+            return self.attach_full_dump_memory()
+
+    def attach_full_dump_memory(self):
+        """ Attach to the full dump memory with the current remote name """
+        name = self.get_full_dump_memory_name()
+        #log.debug("Full dump name={}", name)
+        assert len(name) >= 1
+        # Reuse our attached full dump memory as long as it has not been replaced
+        if self.full_dump_memory and self.full_dump_memory.name == name:
+            return self.full_dump_memory
+        return self.get_memory(create=False, name=name)
 
     #@profile
     def load(self, force=False):
@@ -673,7 +1056,7 @@ class UltraDict(collections.UserDict, dict):
         There is a rare case where a full dump is replaced with a newer full dump while
         we didn't have the chance to load the old one. In this case, we just retry.
         """
-        full_dump_counter = int.from_bytes(self.full_dump_counter_remote, 'little')
+        full_dump_counter = self.read_full_dump_counter()
         #log.debug("Loading full dump local_counter={} remote_counter={}", self.full_dump_counter, full_dump_counter)
         try:
             if force or (self.full_dump_counter < full_dump_counter):
@@ -684,30 +1067,26 @@ class UltraDict(collections.UserDict, dict):
                     full_dump_memory = self.get_full_dump_memory()
 
                 buf = full_dump_memory.buf
-                pos = 0
-
-                # Read header
-                # The first byte should be a FF byte to introduce the header
-                assert bytes(buf[pos:pos+1]) == b'\xFF'
-                pos += 1
-                # Then comes 4 bytes of length
-                length = int.from_bytes(bytes(buf[pos:pos+4]), 'little')
-                assert length > 0, (self.status(), full_dump_memory, bytes(buf[:]).decode('utf-8').strip().strip('\x00'), len(buf))
-                pos += 4
-                #log.debug("Found update, pos={} length={}", pos, length)
-                assert bytes(buf[pos:pos+1]) == b'\xFF'
-                pos += 1
-                # Unserialize the update data, we expect a tuple of key and value
-                self.data = self.serializer.loads(bytes(buf[pos:pos+length]))
+
+                # Read header, FF byte, 4 bytes of length and another FF byte
+                start_marker, length, end_marker = self.header.unpack_from(buf, 0)
+                assert start_marker == 0xFF and end_marker == 0xFF, (self.status(), full_dump_memory, len(buf))
+                pos = 6
+                end_position = pos + length
+                #log.debug("Found full dump, pos={} length={}", pos, length)
+
+                # Unserialize the full dump straight from the shared memory
+                with buf[pos:end_position] as body:
+                    self.data = self.serializer_loads(body)
                 self.full_dump_counter = full_dump_counter
                 self.update_stream_position = 0
 
-                if sys.platform != 'win32' and not self.full_dump_memory:
-                    full_dump_memory.close()
+                # Keep it attached, a forced reload does not need to attach it again
+                self.full_dump_memory = full_dump_memory
             else:
                 raise Exception("Cannot load full dump, no new data available")
-        except AssertionError as e:
-            full_dump_delta = int.from_bytes(self.full_dump_counter_remote, 'little') - self.full_dump_counter
+        except (AssertionError, pickle.UnpicklingError, struct.error, EOFError, ValueError) as e:
+            full_dump_delta = self.control_remote.full_dump_counter - self.full_dump_counter
             if full_dump_delta > 1:
                 # If more than one new full dump was created during the time we were trying to load one full dump
                 # it can happen that our full dump has just disappeared
@@ -717,17 +1096,23 @@ class UltraDict(collections.UserDict, dict):
             raise e
 
     #@profile
-    def append_update(self, key, item, delete=False):
+    def append_update(self, key, item, delete=False, batch=False):
         """ Append dict changes to shared memory stream """
 
         # If mode is 0, it means delete the key from the dict
         # If mode is 1, it means update the key
-        #mode = not delete
-        marshalled = self.serializer.dumps((not delete, key, item))
+        # If mode is 2, it means delete all keys from the list in key, if any, and
+        # update all keys from the list of key value pairs in item
+        if type(item) is int and type(key) is str and not delete and -2**63 <= item < 2**63:
+            marker = 0xFE
+            marshalled = self.int_record.pack(item) + key.encode('utf-8', 'surrogatepass')
+        else:
+            mode = 2 if batch else not delete
+            marker, marshalled = self.serialize_record((mode, key, item))
         length = len(marshalled)
 
         with self.lock:
-            start_position = int.from_bytes(self.update_stream_position_remote, 'little')
+            start_position = self.control_remote.update_stream_position
             # 6 bytes for the header
             end_position = start_position + length + 6
             #log.debug("Update start from={} len={}", start_position, length)
@@ -736,73 +1121,127 @@ class UltraDict(collections.UserDict, dict):
 
                 # todo: is is necessary? apply_update() is also done inside dump()
                 self.apply_update()
-                if not delete:
+                if batch:
+                    for k in key or ():
+                        self.data.pop(k, None)
+                    self.data.update(item)
+                elif not delete:
                     self.data.__setitem__(key, item)
                 self.dump()
                 return
 
-            marshalled = b'\xFF' + length.to_bytes(4, 'little') + b'\xFF' + marshalled
-
+            buf = self.buffer.buf
+            # Write header, 6 bytes
+            self.header.pack_into(buf, start_position, 0xFF, length, marker)
             # Write body with the real data
-            self.buffer.buf[start_position:end_position] = marshalled
+            buf[start_position+6:end_position] = marshalled
 
             # Inform others about it
             self.update_stream_position = end_position
-            self.update_stream_position_remote[:] = end_position.to_bytes(4, 'little')
+            self.publish_update_stream_position(end_position)
             #log.debug("Update end to={} buffer_size={} ", end_position, self.buffer_size)
 
     #@profile
     def apply_update(self):
         """ Opportunistically apply dict changes from shared memory stream without any locking.  """
 
-        if self.full_dump_counter < int.from_bytes(self.full_dump_counter_remote, 'little'):
-            self.load(force=True)
+        # Fast path for the common case that nothing has changed since the last call
+        control = self.control_remote
+        if control.update_stream_position == self.update_stream_position and control.full_dump_counter == self.full_dump_counter:
+            return
 
-        if self.update_stream_position < int.from_bytes(self.update_stream_position_remote, 'little'):
+        # If a new full dump has replaced the stream while we were reading it, retry a few
+        # times without the lock and then once more with it
+        retries = 0
+        locked = False
+        try:
+            while True:
+                if self.full_dump_counter < control.full_dump_counter:
+                    self.load(force=True)
 
-            # Remember start position in the update stream
-            pos = self.update_stream_position
-            #log.debug("Apply update: stream position own={} remote={} full_dump_counter={}", pos, int.from_bytes(self.update_stream_position_remote, 'little'), self.full_dump_counter)
+                # Updates appended by others while we are applying will be picked up by the next call
+                if self.update_stream_position_atomic is not None:
+                    end_position = int.from_bytes(self.update_stream_position_atomic.load(order=atomics.MemoryOrder.ACQUIRE), 'little')
+                else:
+                    end_position = control.update_stream_position
+
+                if self.update_stream_position < end_position:
+
+                    # Remember start position in the update stream
+                    pos = self.update_stream_position
+                    #log.debug("Apply update: stream position own={} remote={} full_dump_counter={}", pos, end_position, self.full_dump_counter)
+
+                    # Local names for everything used per update, this keeps the loop tight
+                    buf = self.buffer.buf
+                    unpack_header = self.header.unpack_from
+                    unpack_int = self.int_record.unpack_from
+                    loads = self.serializer_loads
+                    marshal_loads = marshal.loads
+                    data = self.data
+
+                    try:
+                        # Iterate over all updates until the start of the last update
+                        while pos < end_position:
+                            # Read header, FF byte, 4 bytes of length and another FF byte
+                            start_marker, length, end_marker = unpack_header(buf, pos)
+                            assert start_marker == 0xFF
+                            start = pos + 6
+                            end = start + length
+                            #log.debug("Found update, update_stream_position={} length={}", pos, length + 6)
+                            if end_marker == 0xFE:
+                                # Compact record of an int value with a str key
+                                mode = True
+                                value, = unpack_int(buf, start)
+                                key = str(buf[start+8:end], 'utf-8', 'surrogatepass')
+                            elif end_marker == 0xFD:
+                                mode, key, value = marshal_loads(buf[start:end])
+                            else:
+                                assert end_marker == 0xFF
+                                # Unserialize the update data, we expect a tuple of key and value
+                                mode, key, value = loads(buf[start:end])
+                            # Update or local dict cache (in our parent)
+                            if mode == 2:
+                                if key:
+                                    for k in key:
+                                        data.pop(k, None)
+                                data.update(value)
+                            elif mode:
+                                data[key] = value
+                            else:
+                                # Never fail on a key we don't have, the stream position would
+                                # not advance past this record and we could not read on
+                                data.pop(key, None)
+                            pos = end
+                    except (AssertionError, pickle.UnpicklingError, struct.error, EOFError, ValueError) as e:
+                        # Remember the updates that we have applied before the broken one
+                        self.update_stream_position = pos
+
+                        # It can happen that a slow process is not fast enough reading the stream and some
+                        # other process already got around overwriting the current position. It is possible to
+                        # recover from this situation if and only if a new, fresh full dump exists that can be loaded.
+                        if retries < self.max_retries and self.full_dump_counter < self.control_remote.full_dump_counter:
+                            log.warning(f"Full dumps too fast full_dump_counter={self.full_dump_counter} full_dump_counter_remote={self.control_remote.full_dump_counter}. Consider increasing buffer_size.")
+                            retries += 1
+                            continue
 
-            try:
-                # Iterate over all updates until the start of the last update
-                while pos < int.from_bytes(self.update_stream_position_remote, 'little'):
-                    # Read header
-                    # The first byte should be a FF byte to introduce the headerfull_dump_counter_remote
-                    assert bytes(self.buffer.buf[pos:pos+1]) == b'\xFF'
-                    pos += 1
-                    # Then comes 4 bytes of length
-                    length = int.from_bytes(bytes(self.buffer.buf[pos:pos+4]), 'little')
-                    pos += 4
-                    #log.debug("Found update, update_stream_position={} length={}", self.update_stream_position, length + 6)
-                    assert bytes(self.buffer.buf[pos:pos+1]) == b'\xFF'
-                    pos += 1
-                    # Unserialize the update data, we expect a tuple of key and value
-                    mode, key, value = self.serializer.loads(bytes(self.buffer.buf[pos:pos+length]))
-                    # Update or local dict cache (in our parent)
-                    if mode:
-                        self.data.__setitem__(key, value)
-                    else:
-                        self.data.__delitem__(key)
-                    pos += length
-                    # Remember that we have applied the update
-                    self.update_stream_position = pos
-            except (AssertionError, pickle.UnpicklingError) as e:
+                        # As a last resort, let's get a lock and retry once more. This way we are safe but slow.
+                        if not locked and self.full_dump_counter < self.control_remote.full_dump_counter:
+                            log.warning(f"Full dumps too fast full_dump_counter={self.full_dump_counter} full_dump_counter_remote={self.control_remote.full_dump_counter}. Consider increasing buffer_size.")
+                            # Nobody can overwrite the stream while we hold the lock, so this retry is final.
+                        # With single_writer=True, the lock is a NoLock and this is only best effort.
+                            self.lock.acquire()
+                            locked = True
+                            continue
 
-                # It can happen that a slow process is not fast enough reading the stream and some
-                # other process already got around overwriting the current position. It is possible to
-                # recover from this situation if and only if a new, fresh full dump exists that can be loaded.
-                if self.full_dump_counter < int.from_bytes(self.full_dump_counter_remote, 'little'):
-                    log.warning(f"Full dumps too fast full_dump_counter={self.full_dump_counter} full_dump_counter_remote={int.from_bytes(self.full_dump_counter_remote, 'little')}. Consider increasing buffer_size.")
-                    return self.apply_update()
+                        raise e
 
-                # As a last resort, let's get a lock. This way we are safe but slow.
-                with self.lock:
-                    if self.full_dump_counter < int.from_bytes(self.full_dump_counter_remote, 'little'):
-                        log.warning(f"Full dumps too fast full_dump_counter={self.full_dump_counter} full_dump_counter_remote={int.from_bytes(self.full_dump_counter_remote, 'little')}. Consider increasing buffer_size.")
-                        return self.apply_update()
+                    # Remember that we have applied the updates
+                    self.update_stream_position = pos
 
-                raise e
+                return
+        finally:
+            if locked:
+                self.lock.release()
 
     def update(self, other=None, *args, **kwargs):
         # pylint: disable=arguments-differ, keyword-arg-before-vararg
@@ -810,11 +1249,61 @@ class UltraDict(collections.UserDict, dict):
         # The original signature would be `def update(self, other=None, /, **kwargs)` but
         # this is not possible with Cython. *args will just be ignored.
 
-        if other is not None:
-            for k, v in other.items() if isinstance(other, collections.abc.Mapping) else other:
+        if self.recurse:
+            # Nested dicts need to be converted one by one in __setitem__()
+            if other is not None:
+                for k, v in other.items() if isinstance(other, collections.abc.Mapping) else other:
+                    self[k] = v
+            for k, v in kwargs.items():
                 self[k] = v
-        for k, v in kwargs.items():
-            self[k] = v
+            return
+
+        # Collect all changes so they are written as one single batch update with only
+        # one lock acquisition instead of one for each key
+        items = []
+        if other is not None:
+            items.extend(other.items() if isinstance(other, collections.abc.Mapping) else other)
+        items.extend(kwargs.items())
+
+        if not items:
+            return
+
+        with self.lock:
+            self.apply_update()
+
+            # Update our local copy
+            self.data.update(items)
+
+            if self.bulk_items is not None:
+                self.bulk_items.update(items)
+            else:
+                self.append_update(None, items, batch=True)
+
+    @contextlib.contextmanager
+    def bulk(self):
+        """
+        Stream all changes made inside of the with block as one batch update at the end.
+
+        The lock is held for the whole block and if a key is set or deleted several times,
+        only its last change is streamed. Others will only see the changes after the block.
+        """
+        with self.lock:
+            # Nested bulk blocks are streamed by the outermost one
+            if self.bulk_items is not None:
+                yield self
+                return
+
+            self.apply_update()
+            self.bulk_items = items = {}
+            try:
+                yield self
+            finally:
+                self.bulk_items = None
+                # Our local copy already has all changes, so stream them even on exceptions
+                if items:
+                    deleted = self.bulk_deleted
+                    self.append_update([key for key, item in items.items() if item is deleted] or None,
+                        [(key, item) for key, item in items.items() if item is not deleted], batch=True)
 
     def __delitem__(self, key):
         #log.debug("__delitem__ {}", key)
@@ -824,9 +1313,23 @@ class UltraDict(collections.UserDict, dict):
             # Update our local copy
             self.data.__delitem__(key)
 
-            self.append_update(key, b'', delete=True)
+            # Inside a bulk block, the delete replaces a pending change of this key and is
+            # streamed with the batch at the end. Others might never have seen the key.
+            if self.bulk_items is not None:
+                self.bulk_items[key] = self.bulk_deleted
+            else:
+                self.append_update(key, b'', delete=True)
             # TODO: Do something if append_update() fails
 
+    def clear(self):
+        """ Remove all keys with one empty full dump instead of streaming a delete for every key """
+        with self.lock:
+            self.apply_update()
+            self.data.clear()
+            if self.bulk_items is not None:
+                self.bulk_items.clear()
+            self.dump()
+
     def __setitem__(self, key, item):
         #log.debug("__setitem__ {}, {}", key, item)
         with self.lock:
@@ -834,9 +1337,9 @@ class UltraDict(collections.UserDict, dict):
 
             if self.recurse:
 
-                assert type(self.recurse_register) == UltraDict, "recurse_register must be an UltraDict instance"
+                assert type(self.recurse_register) is UltraDict, "recurse_register must be an UltraDict instance"
 
-                if type(item) == dict:
+                if type(item) is dict:
                     # TODO: Use parent's buffer with a namespace prefix?
                     item = UltraDict(item,
                                      recurse          = True,
@@ -853,33 +1356,48 @@ class UltraDict(collections.UserDict, dict):
             # It's important for the integrity to do this first
             self.data.__setitem__(key, item)
 
-            # Append the update to the update stream
-            self.append_update(key, item)
+            # Append the update to the update stream, or collect it until the end of a bulk block
+            if self.bulk_items is not None:
+                self.bulk_items[key] = item
+            else:
+                self.append_update(key, item)
             # TODO: Do something if append_u int.from_bytes(self.update_stream_position_remote, 'little')pdate() fails
 
     def __getitem__(self, key):
         #log.debug("__getitem__ {}", key)
-        self.apply_update()
+        # Same check as the fast path in apply_update(), inlined to save the
+        # method call for reads when nothing has changed
+        control = self.control_remote
+        if control.update_stream_position != self.update_stream_position or control.full_dump_counter != self.full_dump_counter:
+            self.apply_update()
         return self.data[key]
 
     # deprecated in Python 3
     def has_key(self, key):
-        self.apply_update()
+        control = self.control_remote
+        if control.update_stream_position != self.update_stream_position or control.full_dump_counter != self.full_dump_counter:
+            self.apply_update()
         return key in self.data
 
     def __eq__(self, other):
         return self.apply_update() == other.apply_update()
 
     def __contains__(self, key):
-        self.apply_update()
+        control = self.control_remote
+        if control.update_stream_position != self.update_stream_position or control.full_dump_counter != self.full_dump_counter:
+            self.apply_update()
         return key in self.data
 
     def __len__(self):
-        self.apply_update()
+        control = self.control_remote
+        if control.update_stream_position != self.update_stream_position or control.full_dump_counter != self.full_dump_counter:
+            self.apply_update()
         return len(self.data)
 
     def __iter__(self):
-        self.apply_update()
+        control = self.control_remote
+        if control.update_stream_position != self.update_stream_position or control.full_dump_counter != self.full_dump_counter:
+            self.apply_update()
         return iter(self.data)
 
     def __repr__(self):
@@ -893,22 +1411,26 @@ class UltraDict(collections.UserDict, dict):
 
     def status(self):
         """ Internal debug helper to get the control state variables """
-        ret = { attr: getattr(self, attr) for attr in self.__slots__ if hasattr(self, attr) and attr != 'data' }
-
-        ret['update_stream_position_remote'] = int.from_bytes(self.update_stream_position_remote, 'little')
-        ret['lock_pid_remote']               = int.from_bytes(self.lock_pid_remote, 'little')
-        ret['lock_remote']                   = int.from_bytes(self.lock_remote, 'little')
-        ret['shared_lock_remote']            = self.shared_lock_remote[0:1] == b'1'
-        ret['recurse_remote']                = self.recurse_remote[0:1] == b'1'
+        ret = {}
+        missing = object()
+        for attr in self.status_attributes:
+            value = getattr(self, attr, missing)
+            if value is not missing:
+                ret[attr] = value
+
+        ret['update_stream_position_remote'] = self.control_remote.update_stream_position
+        ret['lock_remote']                   = self.control_remote.lock
+        ret['shared_lock_remote']            = self.control_remote.shared_lock == b'1'
+        ret['recurse_remote']                = self.control_remote.recurse == b'1'
+        ret['single_writer_remote']          = self.control_remote.single_writer == b'1'
         ret['lock']                          = self.lock
-        ret['full_dump_counter_remote']      = int.from_bytes(self.full_dump_counter_remote, 'little')
-        ret['full_dump_memory_name_remote']  = bytes(self.full_dump_memory_name_remote).decode('utf-8').strip('\x00').strip()
+        ret['full_dump_counter_remote']      = self.control_remote.full_dump_counter
+        ret['full_dump_memory_name_remote']  = self.get_full_dump_memory_name()
 
         return ret
 
     def print_status(self, status=None, stderr=False):
         """ Internal debug helper to pretty print the control state variables """
-        import pprint
         if not status:
             status = self.status()
         pprint.pprint(status, stream=sys.stderr if stderr else sys.stdout)
@@ -948,6 +1470,7 @@ class UltraDict(collections.UserDict, dict):
 
         self.apply_update = self.raise_already_closed
         self.append_update = self.raise_already_closed
+        self.control_remote = self.ClosedControl()
 
         return data
 
@@ -962,6 +1485,31 @@ class UltraDict(collections.UserDict, dict):
         self.apply_update()
         return self.data.values()
 
+    def items(self):
+        self.apply_update()
+        return self.data.items()
+
+    @contextlib.contextmanager
+    def fresh(self):
+        """
+        Apply all pending updates once and provide a read-only view on the local dict.
+
+        Reading from the view is as fast as reading from a plain dict because it does
+        not check the stream for updates. Changes from other processes only show up
+        when this process applies updates again, e.g. by using the UltraDict itself.
+
+        The view is only valid until this process loads the next full dump. Loading it
+        replaces the local dict, so the view keeps showing the old state from then on.
+        """
+        self.apply_update()
+        yield types.MappingProxyType(self.data)
+
+    def get(self, key, default=None):
+        control = self.control_remote
+        if control.update_stream_position != self.update_stream_position or control.full_dump_counter != self.full_dump_counter:
+            self.apply_update()
+        return self.data.get(key, default)
+
     def unlink(self):
         self.close(unlink=True)
 
@@ -977,7 +1525,7 @@ class UltraDict(collections.UserDict, dict):
             self.finalizer.detach()
 
         if hasattr(self, 'full_dump_memory_name_remote'):
-            full_dump_name = bytes(self.full_dump_memory_name_remote).decode('utf-8').strip().strip('\x00')
+            full_dump_name = self.get_full_dump_memory_name()
 
         data = self.cleanup()
 
@@ -1003,7 +1551,7 @@ class UltraDict(collections.UserDict, dict):
 
     def unlink_recursed(self):
         #log.debug("Unlink recursed id={}", hex(id(self)))
-        if not self.recurse or (type(self.recurse_register) != UltraDict):
+        if not self.recurse or (type(self.recurse_register) is not UltraDict):
             raise Exception("Cannot unlink recursed for non-recurse UltraDict")
 
         ignore_errors = sys.platform == 'win32'
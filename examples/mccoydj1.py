@@ -12,17 +12,19 @@ import string
 
 name='ultra6'
 
-def P1():
-    ultra = UltraDict(name=name)
+# Maps every random byte to a lowercase letter
+letters = bytes(string.ascii_lowercase.encode()[i % 26] for i in range(256))
 
+def P1(ultra):
+    # Own generator for this process, look up its method only once
+    rnd = random.Random().random
     while True:
-        ultra['P1'] = random.random()
-
-def P2():
-    ultra = UltraDict(name=name)
+        ultra['P1'] = rnd()
 
+def P2(ultra):
     while True:
-        chars = "".join([random.choice(string.ascii_lowercase) for i in range(8)])
+        # Draw 8 random bytes at once instead of choosing every letter separately
+        chars = random.getrandbits(64).to_bytes(8, 'little').translate(letters).decode()
         ultra['P2'] = chars
 
 if __name__ == '__main__':
@@ -32,17 +34,21 @@ if __name__ == '__main__':
 
     UltraDict.unlink_by_name(name, ignore_errors=True)
 
-    ultra = UltraDict({'P1':float(0), 'P2':''}, name=name, buffer_size=100, shared_lock=True)
+    # The tiny buffer causes a full dump all the time, so reserve the full dump memory
+    # once instead of looking up the current full dump memory for every dump
+    ultra = UltraDict({'P1':float(0), 'P2':''}, name=name, buffer_size=100, shared_lock=True, full_dump_size=10_000)
 
-    p1 = multiprocessing.Process(target=P1)
+    p1 = multiprocessing.Process(target=P1, args=[ultra])
     p1.start()
 
-    p2 = multiprocessing.Process(target=P2)
+    p2 = multiprocessing.Process(target=P2, args=[ultra])
     p2.start()
 
     import time
+    # Poll the writers' changes in an interval instead of spinning on the shared memory
     while True:
         print(ultra)
+        time.sleep(0.1)
         #x = str(ultra)
 
     p1.join()
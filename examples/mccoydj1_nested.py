@@ -2,6 +2,7 @@ import sys
 sys.path.insert(0, '..')
 sys.path.insert(0, '../..')
 
+import itertools
 import multiprocessing
 import random
 import string
@@ -13,28 +14,47 @@ from UltraDict import UltraDict
 
 name='ultra6'
 
-def P1():
+# Number of nested updates streamed together as one batch
+batch_size = 256
+
+def random_ip():
+    return f"{random.randint(1, 254)}.{random.randint(1, 254)}.{random.randint(1, 254)}.{random.randint(1, 254)}"
+
+# Number of random IPs generated up front, the writers cycle through them
+# so the loops measure UltraDict and not random.randint()
+ip_pool_size = 100_000
+
+def ip_pool():
+    return itertools.cycle([random_ip() for i in range(ip_pool_size)])
+
+def P1(ultra):
 
     print("START P1", file=sys.stderr)
-    ultra = UltraDict(name=name)
+    ips = ip_pool()
 
     while True:
-        ultra['banned'][f"{random.randint(1, 254)}.{random.randint(1, 254)}.{random.randint(1, 254)}.{random.randint(1, 254)}"] = True
+        # One lock acquisition and one update record per batch instead of per IP
+        with ultra['banned'].bulk() as banned:
+            for i in range(batch_size):
+                banned[next(ips)] = True
         #print('P1', subprocess.check_output(f"lsof -p {multiprocessing.current_process().pid} |wc -l", shell=True))
-        print('P1', ultra)
+        # Printing the whole dict gets slower the more IPs it has, the main process shows it anyway
+        print('P1', len(banned))
 
         #if len(ultra['banned']) > 1000:
         #    ultra['banned'].pop()
 
-def P2():
+def P2(ultra):
 
     print("START P2", file=sys.stderr)
-    ultra = UltraDict(name=name)
+    ips = ip_pool()
 
     while True:
-        chars = "".join([random.choice(string.ascii_lowercase) for i in range(8)])
-        ultra['banned'][f"{random.randint(1, 254)}.{random.randint(1, 254)}.{random.randint(1, 254)}.{random.randint(1, 254)}"] = chars
-        print('P2', ultra)
+        with ultra['banned'].bulk() as banned:
+            for i in range(batch_size):
+                chars = "".join([random.choice(string.ascii_lowercase) for i in range(8)])
+                banned[next(ips)] = chars
+        print('P2', len(banned))
 
 if __name__ == '__main__':
 
@@ -45,16 +65,20 @@ if __name__ == '__main__':
 
     UltraDict.unlink_by_name(name, ignore_errors=True)
 
-    ultra = UltraDict({'banned': { '127.0.0.1': True }}, name=name, buffer_size=10_000, shared_lock=True, recurse=True)
+    # Reserve the full dump memory once, a full dump of both writers' IP pools needs about 6 MB
+    ultra = UltraDict({'banned': { '127.0.0.1': True }}, name=name, buffer_size=10_000, shared_lock=True, recurse=True,
+                      full_dump_size=10_000_000)
 
-    p1 = multiprocessing.Process(target=P1)
+    p1 = multiprocessing.Process(target=P1, args=[ultra])
     p1.start()
 
-    p2 = multiprocessing.Process(target=P2)
+    p2 = multiprocessing.Process(target=P2, args=[ultra])
     p2.start()
 
+    # Poll the writers' changes in an interval instead of spinning on the shared memory
     while True:
         print('MA', ultra)
+        time.sleep(0.1)
         #print('MA', subprocess.check_output(f"lsof -p {multiprocessing.current_process().pid} |wc -l", shell=True))
         #x = str(ultra)
 
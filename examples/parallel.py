@@ -1,5 +1,9 @@
 #
-# Two processes are incrementing a counter in parallel
+# Four processes are incrementing a counter in parallel
+#
+# Every process has its own sub-counter in the dict, so the processes never
+# have to wait for each other to update the same value. The main process sums
+# them up at the end.
 #
 # In this example we use the shared_lock=True parameter.
 # This way of shared locking is safe accross independent
@@ -17,35 +21,44 @@ import multiprocessing
 
 count = 100_000
 
-def run(name, target, x):
-    # Connect to the existing UltraDict by its name
-    d = UltraDict(name=name, shared_lock=True)
+# Number of increments that are counted locally before they are added to the shared counter
+chunk_size = 1024
+
+def run(d, target, x):
+    key = f'counter_{x}'
+    local = 0
     for i in range(target):
-        # Adding 1 to the counter is unfortunately not an atomic operation in Python,
-        # but UltraDict's shared lock comes to our resuce: We can simply reuse it.
-        with d.lock:
-            # Under the lock, we can safely read, modify and write back any values
-            # in the shared dict and be sure that nobody else has modified them
-            # between reading and writing.
-            d['counter'] += 1
-            #print("counter: ", d['counter'], i, x)
+        # Every write to the shared dict costs a lock cycle and a serialized update,
+        # so count locally first and only add the chunks to the shared counter
+        local += 1
+        if local < chunk_size and i < target - 1:
+            continue
+        # Adding to the counter is unfortunately not an atomic operation in Python,
+        # but nobody else writes to our own sub-counter. UltraDict's shared lock still
+        # keeps the writes of all processes to the shared dict from getting mixed up.
+        d[key] += local
+        #print("counter: ", d[key], i, x)
+        local = 0
 
 if __name__ == '__main__':
 
     # No name provided to create a new dict with random name.
     # To make it work under Windows, we need to set a static `full_dump_size`
     ultra = UltraDict(buffer_size=10_000, shared_lock=True, full_dump_size=10_000)
-    ultra['counter'] = 0
+    for x in range(1, 5):
+        ultra[f'counter_{x}'] = 0
 
-    # Our children will use the name to attach to the existing dict
-    name = ultra.name
+    # Forked children inherit the already attached dict. Where fork is not available,
+    # the dict is pickled by name and the children attach to it on their own.
+    if 'fork' in multiprocessing.get_all_start_methods():
+        ctx = multiprocessing.get_context("fork")
+    else:
+        ctx = multiprocessing.get_context("spawn")
 
-    ctx = multiprocessing.get_context("spawn")
-
-    p1 = ctx.Process(target=run, name="Process 1", args=[name, count//4, 1])
-    p2 = ctx.Process(target=run, name="Process 2", args=[name, count//4, 2])
-    p3 = ctx.Process(target=run, name="Process 3", args=[name, count//4, 3])
-    p4 = ctx.Process(target=run, name="Process 4", args=[name, count//4, 4])
+    p1 = ctx.Process(target=run, name="Process 1", args=[ultra, count//4, 1])
+    p2 = ctx.Process(target=run, name="Process 2", args=[ultra, count//4, 2])
+    p3 = ctx.Process(target=run, name="Process 3", args=[ultra, count//4, 3])
+    p4 = ctx.Process(target=run, name="Process 4", args=[ultra, count//4, 4])
 
     # These processes should write more or less at the same time
     p1.start()
@@ -62,4 +75,6 @@ if __name__ == '__main__':
 
     print ("Joined 4 processes")
 
-    print("Counter: ", ultra['counter'], ' == ', count)
+    counter = sum(ultra[f'counter_{x}'] for x in range(1, 5))
+
+    print("Counter: ", counter, ' == ', count)
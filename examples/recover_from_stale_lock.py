@@ -55,8 +55,7 @@ def possibly_simulate_crash(d):
 
         raise Exception("We should never reach this point, because the process should have been killed before.")
 
-def run(name, target):
-    d = UltraDict(name=name)
+def run(d, target):
     process = multiprocessing.process.current_process()
     print(f"Started process name={process.name}, pid={process.pid} {d.lock}")
 
@@ -85,10 +84,15 @@ if __name__ == '__main__':
 
     processes = []
 
-    ctx = multiprocessing.get_context("spawn")
+    # Forked children inherit the already attached dict. Where fork is not available,
+    # the dict is pickled by name and the children attach to it on their own.
+    if 'fork' in multiprocessing.get_all_start_methods():
+        ctx = multiprocessing.get_context("fork")
+    else:
+        ctx = multiprocessing.get_context("spawn")
 
     for x in range(number_of_processes):
-        processes.append(ctx.Process(target=run, name=f"Process {x}", args=[ultra.name, count]))
+        processes.append(ctx.Process(target=run, name=f"Process {x}", args=[ultra, count]))
 
     # These processes should write more or less at the same time
     for p in processes:
@@ -28,6 +28,10 @@ simulate_crash_at_target_count = 10
 # process is actually dead.
 stale_lock_timeout = 1.0
 
+# Sleep between failed lock attempts, doubling up to the maximum
+min_backoff = 0.00005
+max_backoff = 0.01
+
 def possibly_simulate_crash(d):
     """
     Simulate random crash if the counter has reached the target value.
@@ -61,6 +65,9 @@ def run(name, target):
     # The pid of the process that is blocking the lock
     blocking_pid = 0
 
+    # Back off exponentially while the lock is busy instead of spinning
+    backoff = min_backoff
+
     while True:
         print("start count: ", d['counter'], ' | ', process.name, process.pid)
         try:
@@ -79,6 +86,7 @@ def run(name, target):
 
                 # After sucessfully incrementing the counter we reset our timer
                 time_start = 0
+                backoff = min_backoff
 
                 possibly_simulate_crash(d)
 
@@ -92,7 +100,9 @@ def run(name, target):
             # We should not be the blocking pid
             assert process.pid != blocking_pid
 
-            #time.sleep(0.1)
+            time.sleep(backoff)
+            backoff = min(backoff * 2, max_backoff)
+
             time_passed = time.monotonic() - time_start
 
             # If the lock is stale for more than 1 second (plus the time for the initial attempt),
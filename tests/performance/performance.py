@@ -23,12 +23,11 @@ def print_ranking():
     print('\nRanking:')
     for operation_name, operation in ranking.items():
         print(f'  {operation_name}:')
-        top = None
-        for name, value in sorted(operation.items(), key=lambda i: i[1], reverse=True):
-            if not top:
-                top = value
-
-            multiple = round(top/value, 2)
+        items = sorted(operation.items(), key=lambda i: i[1], reverse=True)
+        # The fastest one comes first, a zero speed must not become the top value
+        top = items[0][1]
+        for name, value in items:
+            multiple = round(top/value, 2) if value else float('inf')
             print(f'    {name} = {value:,d} (factor {multiple})')
 
 def main():
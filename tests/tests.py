@@ -1,4 +1,7 @@
 import unittest
+import os
+import random
+import string
 import subprocess
 import sys
 
@@ -11,13 +14,18 @@ if hasattr(UltraDict.log, 'disable'):
 else:
     UltraDict.log.set_level(UltraDict.log.Levels.error)
 
+# Root folder of the repository, the paths of the examples are relative to it
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
 class UltraDictTests(unittest.TestCase):
 
     def setUp(self):
         pass
 
     def exec(self, filepath):
-        ret = subprocess.run([sys.executable, filepath],
+        # The examples find UltraDict relative to their own folder, so run them from there
+        path = os.path.join(root_dir, filepath)
+        ret = subprocess.run([sys.executable, os.path.basename(path)], cwd=os.path.dirname(path),
                 stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
         #print(ret.stdout.decode())
         ret.stdout = ret.stdout.replace(b'\r\n', b'\n');
@@ -30,9 +38,14 @@ class UltraDictTests(unittest.TestCase):
     def assertReturnCode(self, ret, target=0):
         return self.assertEqual(ret.returncode, target, self.exec_show_output(ret))
 
-    def test_count(self):
-        ultra = UltraDict()
+    def connect(self, **kwargs):
+        """ Create an UltraDict and connect a second one to it via `name` """
+        ultra = UltraDict(**kwargs)
         other = UltraDict(name=ultra.name)
+        return ultra, other
+
+    def test_count(self):
+        ultra, other = self.connect()
 
         count = 100
         for i in range(count//2):
@@ -61,19 +74,30 @@ class UltraDictTests(unittest.TestCase):
         self.assertEqual(len(other.data['huge']), length)
 
     def test_parameter_passing(self):
-        ultra = UltraDict(shared_lock=True, buffer_size=4096*8, full_dump_size=4096*8)
-        # Connect `other` dict to `ultra` dict via `name`
-        other = UltraDict(name=ultra.name)
+        ultra, other = self.connect(shared_lock=True, buffer_size=4096*8, full_dump_size=4096*8)
 
         self.assertIsInstance(ultra.lock, ultra.SharedLock)
         self.assertIsInstance(other.lock, other.SharedLock)
 
         self.assertEqual(ultra.buffer_size, other.buffer_size)
 
+    def test_single_writer(self):
+        ultra, other = self.connect(single_writer=True)
+
+        self.assertIsInstance(ultra.lock, ultra.NoLock)
+
+        ultra[1] = 1
+        with ultra.lock:
+            ultra[1] += 1
+
+        self.assertEqual(other[1], 2)
+
+        self.assertIsInstance(other.lock, other.NoLock)
+        with self.assertRaises(UltraDict.Exceptions.ParameterMismatch):
+            UltraDict(name=ultra.name, single_writer=False)
+
     def test_iter(self):
-        ultra = UltraDict()
-        # Connect `other` dict to `ultra` dict via `name`
-        other = UltraDict(name=ultra.name)
+        ultra, other = self.connect()
 
         ultra[1] = 1
         ultra[2] = 2
@@ -86,20 +110,185 @@ class UltraDictTests(unittest.TestCase):
 
         self.assertEqual(ultra.items(), other.items())
 
+    def test_fresh(self):
+        ultra, other = self.connect()
+
+        ultra[1] = 1
+
+        with other.fresh() as data:
+            self.assertEqual(data[1], 1)
+            # Not applied until we use `other` again
+            ultra[2] = 2
+            self.assertNotIn(2, data)
+            with self.assertRaises(TypeError):
+                data[3] = 3
+
+        self.assertEqual(other[2], 2)
+
+    def test_fresh_full_dump(self):
+        ultra, other = self.connect()
+
+        ultra[1] = 1
+
+        with other.fresh() as data:
+            ultra[2] = 2
+            ultra.dump()
+            # Loading the full dump replaces the dict behind the view
+            self.assertEqual(other[2], 2)
+            self.assertNotIn(2, data)
+
+        with other.fresh() as data:
+            self.assertEqual(data[2], 2)
+
+    def test_update(self):
+        ultra, other = self.connect()
+
+        ultra.update({1: 1, 2: 2}, three=3)
+        ultra.update([(4, 4), (5, 5)])
+
+        self.assertEqual(len(other), 5)
+        self.assertEqual(other.update_stream_position, ultra.update_stream_position)
+        self.assertEqual(ultra.items(), other.items())
+
+    def test_value_types(self):
+        import array
+        ultra, other = self.connect()
+
+        values = {
+            'str': 'abc', 'float': 1.5, 'nested': {'list': [1, None, (True, b'x')]},
+            'bytearray': bytearray(b'abc'), 'array': array.array('i', [1, 2]),
+            'list_of_bytearray': [bytearray(b'abc')],
+        }
+        ultra.update(values)
+        for key, value in values.items():
+            ultra[key] = value
+
+        for key, value in values.items():
+            self.assertEqual(other[key], value)
+            self.assertIs(type(other[key]), type(value))
+        self.assertIs(type(other['list_of_bytearray'][0]), bytearray)
+
+    def test_bulk(self):
+        ultra, other = self.connect()
+
+        ultra['gone'] = 0
+        position = ultra.update_stream_position
+
+        with ultra.bulk():
+            for i in range(100):
+                ultra['counter'] = ultra.get('counter', 0) + 1
+            ultra.update(more=1)
+            del ultra['gone']
+            self.assertNotIn('counter', other)
+
+        self.assertEqual(other['counter'], 100)
+        self.assertEqual(other['more'], 1)
+        self.assertNotIn('gone', other)
+        self.assertEqual(ultra.items(), other.items())
+        # Only one batch record, including the delete
+        self.assertLess(ultra.update_stream_position - position, 100)
+
+    def test_bulk_delete(self):
+        ultra, other = self.connect()
+
+        ultra['kept'] = 1
+        with ultra.bulk():
+            ultra['new'] = 1
+            del ultra['new']
+            del ultra['kept']
+            ultra['again'] = 1
+            del ultra['again']
+            ultra['again'] = 2
+
+        self.assertEqual(len(other), 1)
+        self.assertNotIn('new', other)
+        self.assertNotIn('kept', other)
+        self.assertEqual(other['again'], 2)
+        self.assertEqual(ultra.items(), other.items())
+
+    def test_bulk_exception(self):
+        ultra, other = self.connect()
+
+        with self.assertRaises(KeyError):
+            with ultra.bulk():
+                ultra['set'] = 1
+                del ultra['missing']
+
+        # Changes made before the exception are in our local copy, so they are streamed as well
+        self.assertEqual(other['set'], 1)
+        self.assertEqual(ultra.items(), other.items())
+
+        # The bulk block is over, so changes are streamed right away again
+        ultra['after'] = 1
+        self.assertEqual(other['after'], 1)
+
+    def test_bulk_nested(self):
+        ultra, other = self.connect()
+
+        with ultra.bulk():
+            ultra['outer'] = 1
+            with ultra.bulk():
+                ultra['inner'] = 1
+                del ultra['outer']
+            # Only the outermost block streams the changes
+            self.assertNotIn('inner', other)
+            ultra['outer'] = 2
+
+        self.assertEqual(other['inner'], 1)
+        self.assertEqual(other['outer'], 2)
+        self.assertEqual(ultra.items(), other.items())
+
     def test_delete(self):
-        import random
-        import string
         letters = string.ascii_lowercase
-        rand_str =   ''.join(random.choice(letters) for i in range(1000))
+        rand_str = ''.join(random.choices(letters, k=1000))
         my_dict = UltraDict(buffer_size=10_000_000)
-        for i in range(100_000):
+        for i in range(1000):
             my_dict[i] = rand_str
-        for i in list(my_dict.keys()):
+        # The keys are known, no need to copy them before deleting
+        for i in range(1000):
             del my_dict[i]
         self.assertEqual(len(my_dict), 0)
 
+    def test_clear(self):
+        ultra, other = self.connect(buffer_size=10_000_000)
+
+        for i in range(100_000):
+            ultra[i] = i
+        self.assertEqual(len(other), 100_000)
+
+        full_dump_counter = ultra.full_dump_counter
+        ultra.clear()
+
+        self.assertEqual(len(ultra), 0)
+        self.assertEqual(len(other), 0)
+        # Cleared with one full dump instead of a delete record for every key
+        self.assertEqual(ultra.full_dump_counter, full_dump_counter + 1)
+        self.assertEqual(ultra.update_stream_position, 0)
+
+        other[1] = 1
+        self.assertEqual(ultra[1], 1)
+
+    def test_closed(self):
+        ultra = UltraDict()
+        ultra[1] = 1
+        ultra.close()
+
+        with self.assertRaises(UltraDict.Exceptions.AlreadyClosed):
+            ultra[1]
+        with self.assertRaises(UltraDict.Exceptions.AlreadyClosed):
+            1 in ultra
+        with self.assertRaises(UltraDict.Exceptions.AlreadyClosed):
+            len(ultra)
+        with self.assertRaises(UltraDict.Exceptions.AlreadyClosed):
+            iter(ultra)
+        with self.assertRaises(UltraDict.Exceptions.AlreadyClosed):
+            ultra.has_key(1)
+        with self.assertRaises(UltraDict.Exceptions.AlreadyClosed):
+            ultra.get(1)
+
     def test_already_exists(self):
-        name = 'ultra_test'
+        # Unique per process, so test runs in parallel don't use the same shared memory
+        name = f'ultra_test_{os.getpid()}'
         # Ensure we have a clean state before the test
         UltraDict.unlink_by_name(name, ignore_errors=True)
         UltraDict.unlink_by_name(name + '_memory', ignore_errors=True)
@@ -109,7 +298,8 @@ class UltraDictTests(unittest.TestCase):
             u2 = UltraDict(name=name, create=True)
 
     def test_not_already_exists(self):
-        name = 'ultra_test'
+        # Unique per process, so test runs in parallel don't use the same shared memory
+        name = f'ultra_test_{os.getpid()}'
         # Ensure we have a clean state before the test
         UltraDict.unlink_by_name(name, ignore_errors=True)
         UltraDict.unlink_by_name(name + '_memory', ignore_errors=True)